@@ -0,0 +1,298 @@
+"""Modul für den Versionsverlauf der Accounts."""
+
+import gzip
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+
+
+class AccountHistory:
+    """
+    @brief Speichert frühere Versionen der Accounts in einer komprimierten Nebendatei.
+
+    Beim Speichern der Accounts werden alle Änderungen gegenüber dem zuletzt
+    gespeicherten Stand gemeinsam als ein gzip-Block an die Datei angehängt
+    (append-only). Eine Version enthält nur die Felder, die sich gegenüber
+    der vorherigen Version desselben Dienstes geändert haben (Delta).
+    Die Datei wird erst gelesen, wenn der Verlauf tatsächlich benötigt wird,
+    damit das Laden der Accounts nicht langsamer wird.
+    """
+
+    #Felder, deren Änderungen im Verlauf festgehalten werden
+    FIELDS = ('Username', 'Password', 'Category')
+
+    #Ist die Datei größer als dieser Anteil der unkomprimierten Daten,
+    #werden die angehängten Blöcke zu einem einzigen zusammengefasst
+    COMPACT_RATIO = 0.5
+
+    #Pflichtfelder jedes Eintrags in der Verlaufsdatei
+    REQUIRED_KEYS = ('Service', 'Version', 'Timestamp')
+
+    def __init__(self, history_file):
+        """
+        @brief Initialisiert den Verlauf, ohne die Datei zu lesen.
+
+        @param history_file Pfad zur komprimierten Verlaufsdatei
+        """
+        self.history_file = history_file
+
+        #Letzter gespeicherter Zustand je Dienst, wird beim ersten Bedarf geladen
+        self._states = None
+
+    # ---------------- Lesen ----------------
+
+    def _read_records(self):
+        """
+        @brief Liest alle gespeicherten Einträge der Reihe nach ein.
+
+        Jeder angehängte gzip-Block wird beim Lesen automatisch
+        zusammengefügt. Ein unvollständiger letzter Block (z.B. nach einem
+        Absturz beim Schreiben) wird ignoriert.
+
+        @return Tupel aus Liste aller Einträge, unkomprimierter Größe in Bytes
+                und ob der letzte Block unvollständig war
+        @throws ValueError Falls die Verlaufsdatei beschädigt ist oder ein
+                Eintrag unvollständig ist
+        """
+        records = []
+        raw_size = 0
+        truncated = False
+
+        if not os.path.exists(self.history_file):
+            return records, raw_size, truncated
+
+        try:
+            with gzip.open(self.history_file, 'rt', encoding='utf-8') as file:
+                for number, line in enumerate(file, start=1):
+                    raw_size += len(line.encode('utf-8'))
+                    if not line.strip():
+                        continue
+
+                    record = json.loads(line)
+                    if not isinstance(record, dict) or any(key not in record for key in self.REQUIRED_KEYS):
+                        raise ValueError(f'unvollständiger Eintrag in Zeile {number}')
+                    records.append(record)
+        except EOFError:
+            truncated = True
+        except (OSError, ValueError, zlib.error) as e:
+            raise ValueError(f'Verlaufsdatei {self.history_file} ist beschädigt: {e}')
+
+        return records, raw_size, truncated
+
+    @classmethod
+    def _apply(cls, state, record):
+        """
+        @brief Wendet einen Eintrag auf den bisherigen Zustand an.
+
+        @param state Bisheriger Zustand als Dictionary
+        @param record Eintrag aus der Verlaufsdatei
+        @return Neuer vollständiger Zustand als Dictionary
+        """
+        new_state = dict(state)
+        new_state.update(record.get('Changes', {}))
+        new_state['Deleted'] = record.get('Deleted', False)
+        new_state['Version'] = record['Version']
+        return new_state
+
+    def _load_states(self):
+        """
+        @brief Liest die Datei einmalig und merkt sich den letzten Zustand je Dienst.
+
+        Ist die Datei durch viele angehängte Blöcke schlecht komprimiert oder
+        der letzte Block unvollständig, wird sie dabei neu geschrieben.
+
+        @return Dictionary mit dem letzten Zustand je Dienst
+        """
+        if self._states is not None:
+            return self._states
+
+        records, raw_size, truncated = self._read_records()
+
+        states = {}
+        for record in records:
+            service = record['Service']
+            states[service] = self._apply(states.get(service, {}), record)
+
+        if truncated or (records and os.path.getsize(self.history_file) > raw_size * self.COMPACT_RATIO):
+            self._write_all(records)
+
+        self._states = states
+        return states
+
+    def get_versions(self, service):
+        """
+        @brief Gibt alle Versionen eines Dienstes vollständig zusammengesetzt zurück.
+
+        @param service Name des Dienstes
+        @return Liste von Dictionaries (älteste Version zuerst) mit Version,
+                Timestamp, Username, Password, Category, Deleted und Changed
+        """
+        versions = []
+        state = {}
+
+        for record in self._read_records()[0]:
+            if record['Service'] != service:
+                continue
+
+            state = self._apply(state, record)
+            version = dict(state)
+            version['Service'] = service
+            version['Timestamp'] = record['Timestamp']
+            version['Changed'] = list(record.get('Changes', {}))
+            versions.append(version)
+
+        return versions
+
+    def list_services(self):
+        """
+        @brief Gibt alle Dienste zurück, für die ein Verlauf existiert.
+
+        @return Liste der Dienstnamen in der Reihenfolge ihres ersten Eintrags
+        """
+        return list(self._load_states())
+
+    # ---------------- Schreiben ----------------
+
+    def _append(self, records):
+        """
+        @brief Hängt mehrere Einträge gemeinsam als einen gzip-Block an die Datei an.
+
+        @param records Die zu speichernden Einträge
+        """
+        with gzip.open(self.history_file, 'at', encoding='utf-8') as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def _write_all(self, records):
+        """
+        @brief Schreibt alle Einträge als einen einzigen gzip-Block neu.
+
+        Die alte Datei wird erst ersetzt, wenn die neue vollständig ist.
+
+        @param records Die zu speichernden Einträge
+        """
+        temp_file = self.history_file + '.tmp'
+        with gzip.open(temp_file, 'wt', encoding='utf-8') as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        os.replace(temp_file, self.history_file)
+
+    def record_accounts(self, accounts):
+        """
+        @brief Speichert den Zustand aller Accounts als neue Versionen.
+
+        Verglichen wird mit dem zuletzt gespeicherten Zustand je Dienst. Es
+        werden nur geänderte Felder gespeichert; Dienste, die nicht mehr in
+        der Liste stehen, werden als gelöscht vermerkt.
+
+        @param accounts Liste aller aktuell gespeicherten Accounts
+        @return Anzahl der neu gespeicherten Versionen
+        """
+        states = self._load_states()
+        timestamp = datetime.now().isoformat(timespec='seconds')
+
+        current = {}
+        for account in accounts:
+            current.setdefault(account.service, account.to_dict())
+
+        records = []
+
+        for service, data in current.items():
+            previous = states.get(service, {})
+            next_version = previous.get('Version', 0) + 1
+
+            if previous.get('Deleted'):
+                #Nach dem Löschen beginnt eine neue, vollständige Version
+                previous = {}
+
+            changes = {
+                field: data[field]
+                for field in self.FIELDS
+                if previous.get(field) != data[field]
+            }
+            if changes:
+                records.append({
+                    'Service': service,
+                    'Version': next_version,
+                    'Timestamp': timestamp,
+                    'Changes': changes
+                })
+
+        for service, previous in states.items():
+            if service not in current and not previous['Deleted']:
+                records.append({
+                    'Service': service,
+                    'Version': previous['Version'] + 1,
+                    'Timestamp': timestamp,
+                    'Changes': {},
+                    'Deleted': True
+                })
+
+        if records:
+            self._append(records)
+            for record in records:
+                states[record['Service']] = self._apply(states.get(record['Service'], {}), record)
+
+        return len(records)
+
+    # ---------------- Bereinigen ----------------
+
+    def prune(self, max_versions=None, max_age_days=None):
+        """
+        @brief Entfernt alte Versionen aller Dienste in einem Durchgang.
+
+        Die neueste Version eines Dienstes bleibt immer erhalten. Die älteste
+        verbleibende Version wird als vollständiger Zustand neu gespeichert,
+        damit die Deltas weiterhin zusammengesetzt werden können.
+
+        @param max_versions Maximale Anzahl Versionen pro Dienst (None = unbegrenzt)
+        @param max_age_days Maximales Alter einer Version in Tagen (None = unbegrenzt)
+        @return Anzahl der entfernten Versionen
+        """
+        states = {}
+        grouped = {}
+
+        for position, record in enumerate(self._read_records()[0]):
+            service = record['Service']
+            states[service] = self._apply(states.get(service, {}), record)
+            grouped.setdefault(service, []).append(
+                (position, record, dict(states[service]))
+            )
+
+        if max_age_days is not None:
+            cutoff = datetime.now() - timedelta(days=max_age_days)
+
+        kept = []
+        removed = 0
+
+        for service, entries in grouped.items():
+            keep = entries
+            if max_versions is not None:
+                keep = keep[-max(max_versions, 1):]
+            if max_age_days is not None:
+                keep = [
+                    entry for entry in keep[:-1]
+                    if datetime.fromisoformat(entry[1]['Timestamp']) >= cutoff
+                ] + keep[-1:]
+
+            removed += len(entries) - len(keep)
+
+            for number, (position, record, state) in enumerate(keep):
+                if number == 0 and record is not entries[0][1]:
+                    #Älteste verbleibende Version als vollständigen Zustand speichern
+                    record = dict(record)
+                    record['Changes'] = {field: state[field] for field in self.FIELDS}
+                kept.append((position, record))
+
+        if removed == 0:
+            return 0
+
+        #Ursprüngliche Reihenfolge beibehalten
+        kept.sort(key=lambda entry: entry[0])
+        self._write_all([record for position, record in kept])
+
+        #Letzte Zustände bleiben gleich, nur der Cache wird neu aufgebaut
+        self._states = None
+
+        return removed
@@ -1,6 +1,7 @@
 """Modul für die Verwaltung von Accounts."""
 
 from pm_account import Account
+from pm_account_history import AccountHistory
 import json
 
 
@@ -15,9 +16,13 @@ class AccountManager:
     #Zentraler Speicherort für die Datenbankdatei → einfache Anpassung möglich
     DATA_FILE = 'pm_data.json' 
 
+    #Komprimierte Nebendatei für den Versionsverlauf der Accounts
+    HISTORY_FILE = 'pm_history.jsonl.gz'
+
     def __init__(self):
         """@brief Initialisiert den AccountManager mit leerer Account-Liste."""
         self.accounts = []
+        self.history = AccountHistory(self.HISTORY_FILE)
 
     # ---------------- Hinzufügen ----------------
 
@@ -25,9 +30,58 @@ class AccountManager:
         """
         @brief Fügt einen neuen Account zur Liste hinzu.
         
+        Der Dienstname muss eindeutig sein, da der Verlauf je Dienst geführt wird.
+        
         @param account Der hinzuzufügende Account
+        @return True bei Erfolg, False falls der Dienst bereits existiert
         """
+        if self.find_account(account.service) is not None:
+            return False
+
         self.accounts.append(account)
+        return True
+
+    def find_account(self, service):
+        """
+        @brief Sucht die Position eines Accounts anhand des Dienstnamens.
+        
+        @param service Name des Dienstes
+        @return Index des Accounts oder None, falls nicht vorhanden
+        """
+        for index, account in enumerate(self.accounts):
+            if account.service == service:
+                return index
+        return None
+
+    
+    
+    # ---------------- Bearbeiten ----------------
+
+    def update_account(self, index: int, username=None, password=None, category=None):
+        """
+        @brief Ändert einen Account.
+        
+        Die neue Version wird beim nächsten Speichern im Verlauf festgehalten.
+        
+        @param index Position des Accounts in der Liste
+        @param username Neuer Benutzername (None = unverändert)
+        @param password Neues Passwort (None = unverändert)
+        @param category Neue Kategorie (None = unverändert)
+        @return True bei Erfolg, sonst False
+        """
+        if not 0 <= index < len(self.accounts):
+            return False
+
+        account = self.accounts[index]
+
+        if username is not None:
+            account.username = username
+        if password is not None:
+            account.password = password
+        if category is not None:
+            account.category = category
+
+        return True
 
    
    
@@ -50,15 +104,31 @@ class AccountManager:
         @brief Speichert alle Accounts in die JSON-Datei.
         
         Die Accounts werden als Liste von Dictionaries im JSON-Format gespeichert.
+        Anschließend werden alle Änderungen seit dem letzten Speichern im
+        Verlauf festgehalten, sodass dieser nur gespeicherte Stände enthält.
+        
+        @return Anzahl der neu gespeicherten Versionen
+        @throws ValueError Falls die Verlaufsdatei beschädigt ist
+        """
+        return self._write_accounts(self.accounts)
+
+    def _write_accounts(self, accounts):
+        """
+        @brief Schreibt die übergebenen Accounts in die JSON-Datei und ergänzt den Verlauf.
+        
+        @param accounts Die zu speichernden Accounts
+        @return Anzahl der neu gespeicherten Versionen
         """
         with open(self.DATA_FILE, 'w', encoding='utf-8') as file:
             json.dump(
-                [account.to_dict() for account in self.accounts],
+                [account.to_dict() for account in accounts],
                 file,
                 indent=2,
                 ensure_ascii=False
             )
 
+        return self.history.record_accounts(accounts)
+
     
     
     # ---------------- Laden ----------------
@@ -68,6 +138,10 @@ class AccountManager:
         @brief Lädt Accounts aus der JSON-Datei.
         
         Erstellt eine neue leere Datei, falls diese nicht existiert.
+        Doppelte Dienstnamen aus älteren Dateien werden umbenannt, da der
+        Verlauf je Dienst geführt wird.
+        
+        @return Liste der Umbenennungen als (alter Name, neuer Name)
         """
         try:
             with open(self.DATA_FILE, 'r', encoding='utf-8') as file:
@@ -83,13 +157,141 @@ class AccountManager:
             with open(self.DATA_FILE, 'w', encoding='utf-8') as file:
                 json.dump([], file, indent=2, ensure_ascii=False)
 
+        return self._make_services_unique(self.accounts)
+
+    @staticmethod
+    def _make_services_unique(accounts):
+        """
+        @brief Benennt Accounts mit bereits vergebenem Dienstnamen um (z.B. "gmail (2)").
+        
+        @param accounts Liste der Accounts, wird direkt angepasst
+        @return Liste der Umbenennungen als (alter Name, neuer Name)
+        """
+        services = set()
+        renamed = []
+
+        for account in accounts:
+            if account.service in services:
+                number = 2
+                while f'{account.service} ({number})' in services:
+                    number += 1
+                new_service = f'{account.service} ({number})'
+                renamed.append((account.service, new_service))
+                account.service = new_service
+            services.add(account.service)
+
+        return renamed
+
     
     
     # ---------------- Löschen ----------------
 
     def delete_account(self, index: int):
+        """
+        @brief Löscht einen Account.
+        
+        Die Löschung wird beim nächsten Speichern im Verlauf vermerkt.
+        
+        @param index Position des Accounts in der Liste
+        @return True bei Erfolg, sonst False
+        """
         if 0 <= index < len(self.accounts):
             del self.accounts[index]
             return True
         return False
 
+    
+    
+    # ---------------- Verlauf ----------------
+
+    def get_history(self, service):
+        """
+        @brief Gibt alle gespeicherten Versionen eines Dienstes zurück.
+        
+        Der Verlauf wird erst hier aus der Nebendatei gelesen.
+        
+        @param service Name des Dienstes
+        @return Liste der Versionen (älteste zuerst)
+        @throws ValueError Falls die Verlaufsdatei beschädigt ist
+        """
+        return self.history.get_versions(service)
+
+    def list_history_services(self):
+        """
+        @brief Gibt alle Dienste mit Verlauf zurück, auch bereits gelöschte.
+        
+        @return Liste der Dienstnamen
+        """
+        return self.history.list_services()
+
+    def restore_version(self, service, version: int):
+        """
+        @brief Stellt eine frühere Version eines Accounts wieder her.
+        
+        Existiert der Account nicht mehr, wird er neu angelegt. In der
+        JSON-Datei wird nur dieser Account geändert und als neue Version im
+        Verlauf festgehalten; andere ungespeicherte Änderungen bleiben offen
+        und können weiterhin per Laden verworfen werden.
+        
+        @param service Name des Dienstes
+        @param version Nummer der wiederherzustellenden Version
+        @return True bei Erfolg, sonst False
+        @throws ValueError Falls die Verlaufsdatei beschädigt ist
+        """
+        for entry in self.get_history(service):
+            if entry['Version'] == version and not entry['Deleted']:
+                break
+        else:
+            return False
+
+        index = self.find_account(service)
+
+        if index is not None:
+            self.update_account(
+                index,
+                username=entry['Username'],
+                password=entry['Password'],
+                category=entry['Category']
+            )
+        else:
+            self.add_account(Account(
+                service=service,
+                username=entry['Username'],
+                password=entry['Password'],
+                category=entry['Category']
+            ))
+
+        #Nur den wiederhergestellten Account in den gespeicherten Stand übernehmen
+        try:
+            with open(self.DATA_FILE, 'r', encoding='utf-8') as file:
+                stored = [Account.from_dict(item) for item in json.load(file)]
+        except FileNotFoundError:
+            stored = []
+        self._make_services_unique(stored)
+
+        restored = Account(
+            service=service,
+            username=entry['Username'],
+            password=entry['Password'],
+            category=entry['Category']
+        )
+        for position, account in enumerate(stored):
+            if account.service == service:
+                stored[position] = restored
+                break
+        else:
+            stored.append(restored)
+
+        self._write_accounts(stored)
+        return True
+
+    def prune_history(self, max_versions=None, max_age_days=None):
+        """
+        @brief Entfernt alte Versionen gemäß der Aufbewahrungsregel.
+        
+        @param max_versions Maximale Anzahl Versionen pro Dienst
+        @param max_age_days Maximales Alter einer Version in Tagen
+        @return Anzahl der entfernten Versionen
+        """
+        return self.history.prune(max_versions, max_age_days)
+
@@ -17,7 +17,7 @@ def show_menu():
     """
     @brief Zeigt das Hauptmenü an und gibt die Benutzerauswahl zurück.
     
-    @return Die gewählte Menüoption (0-7)
+    @return Die gewählte Menüoption (0-10)
     """
     print('\n--- Passwort-Manager ---')
     print('1. Account hinzufügen')
@@ -27,15 +27,18 @@ def show_menu():
     print('5. Passwort bewerten - KI')
     print('6. Accounts speichern')
     print('7. Accounts laden')
+    print('8. Account bearbeiten')
+    print('9. Verlauf anzeigen / wiederherstellen')
+    print('10. Verlauf bereinigen')
     print('0. Beenden')
 
     while True:
         try:
             choice = int(input('Deine Wahl: '))
-            if 0 <= choice <= 7:
+            if 0 <= choice <= 10:
                 return choice
             else:
-                print('Bitte eine Zahl zwischen 0 und 7 eingeben.')
+                print('Bitte eine Zahl zwischen 0 und 10 eingeben.')
         except ValueError:
             print('Ungültige Eingabe. Bitte eine Zahl eingeben.')
 
@@ -50,6 +53,12 @@ def create_account(manager: AccountManager, ki_service: KIService):
     print('\n--- Account hinzufügen ---')
 
     service = input('Dienst: ').strip()
+
+    #Dienstnamen müssen eindeutig sein, da der Verlauf je Dienst geführt wird
+    if manager.find_account(service) is not None:
+        print(f'Für {service} existiert bereits ein Account. Bitte "Account bearbeiten" verwenden.')
+        return
+
     username = input('Benutzername: ').strip()
     category = input('Kategorie: ').strip()
 
@@ -131,14 +140,30 @@ def list_accounts(manager: AccountManager):
 
 #Funktion zum speichern der Accounts
 def save_accounts(manager: AccountManager):
-    manager.save_to_json()
-    print('Accounts wurden gespeichert.')
+    try:
+        manager.save_to_json()
+        print('Accounts wurden gespeichert.')
+    except (OSError, ValueError) as e:
+        print('Fehler beim Speichern:')
+        print(e)
 
 
 #Funktion zum Laden der Accounts
 def load_accounts(manager: AccountManager):
-    manager.load_from_json()
+    renamed = manager.load_from_json()
     print('Accounts wurden geladen.')
+    report_renamed_services(renamed)
+
+
+#Funktion zum Melden umbenannter doppelter Dienste
+def report_renamed_services(renamed):
+    """
+    @brief Meldet Accounts, deren doppelter Dienstname beim Laden geändert wurde.
+    
+    @param renamed Liste der Umbenennungen als (alter Name, neuer Name)
+    """
+    for old_service, new_service in renamed:
+        print(f'Doppelter Dienst {old_service} wurde in {new_service} umbenannt (wird beim Speichern übernommen).')
 
 
 #Funktion zum Löschen eines Accounts
@@ -172,6 +197,203 @@ def delete_account(manager: AccountManager):
             print('Ungültige Eingabe. Bitte eine Zahl eingeben.')
 
 
+#Funktion zum Bearbeiten eines Accounts
+def edit_account(manager: AccountManager, ki_service: KIService):
+    """
+    @brief Ändert Benutzername, Kategorie oder Passwort eines Accounts.
+    
+    Leere Eingaben lassen das jeweilige Feld unverändert. Die Änderung wird
+    beim nächsten Speichern im Verlauf festgehalten.
+    
+    @param manager Der AccountManager mit den Accounts
+    @param ki_service KI-Service für optionale Passwortgenerierung
+    """
+    print('\n--- Account bearbeiten ---')
+
+    accounts = manager.list_accounts()
+
+    if not accounts:
+        print('Keine Accounts vorhanden.')
+        return
+
+    for index, account in enumerate(accounts, start=1):
+        masked_password = '*' * len(account.password)
+        print(f'{index}. Dienst: {account.service}, Benutzername: {account.username}, Kategorie: {account.category}, Passwort: {masked_password}')
+
+    try:
+        index = int(input('\nNummer des Accounts (0 zum Abbrechen): ')) - 1
+    except ValueError:
+        print('Ungültige Eingabe. Bitte eine Zahl eingeben.')
+        return
+
+    if index == -1:
+        print('Bearbeiten abgebrochen.')
+        return
+    if not 0 <= index < len(accounts):
+        print('Ungültige Nummer.')
+        return
+
+    username = input('Neuer Benutzername (Enter = unverändert): ').strip() or None
+    category = input('Neue Kategorie (Enter = unverändert): ').strip() or None
+
+    print('\nPasswort ändern:')
+    print('1 - Manuell eingeben')
+    print('2 - Von KI generieren')
+    print('Enter - Unverändert lassen')
+
+    choice = input('Deine Wahl: ').strip()
+    password = None
+
+    if choice == '1':
+        password = input('Neues Passwort: ').strip() or None
+
+    elif choice == '2':
+        try:
+            length = int(input('Gewünschte Passwortlänge: '))
+            password = ki_service.generate_password(length)
+            print(f'Generiertes Passwort: {password}')
+        except Exception as e:
+            print('Fehler bei der KI-Verbindung:')
+            print(e)
+            return
+
+    manager.update_account(index, username=username, password=password, category=category)
+    print('Account wurde aktualisiert.')
+
+
+#Funktion zum Anzeigen und Wiederherstellen früherer Versionen
+def show_history(manager: AccountManager):
+    """
+    @brief Zeigt den Verlauf eines Dienstes an und stellt auf Wunsch eine Version wieder her.
+    
+    Es werden auch bereits gelöschte Dienste angeboten, damit diese
+    wiederhergestellt werden können.
+    
+    @param manager Der AccountManager mit den Accounts
+    """
+    print('\n--- Verlauf anzeigen ---')
+
+    try:
+        services = manager.list_history_services()
+    except ValueError as e:
+        print(e)
+        return
+
+    if not services:
+        print('Kein Verlauf vorhanden.')
+        return
+
+    for index, service in enumerate(services, start=1):
+        print(f'{index}. {service}')
+
+    try:
+        index = int(input('\nNummer des Dienstes (0 zum Abbrechen): ')) - 1
+    except ValueError:
+        print('Ungültige Eingabe. Bitte eine Zahl eingeben.')
+        return
+
+    if index == -1:
+        return
+    if not 0 <= index < len(services):
+        print('Ungültige Nummer.')
+        return
+
+    service = services[index]
+    try:
+        versions = manager.get_history(service)
+    except ValueError as e:
+        print(e)
+        return
+
+    print(f'\nVerlauf für {service}:')
+    for entry in versions:
+        if entry['Deleted']:
+            print(f"Version {entry['Version']} ({entry['Timestamp']}): gelöscht")
+            continue
+        masked_password = '*' * len(entry['Password'])
+        changed = ', '.join(entry['Changed']) or '-'
+        print(f"Version {entry['Version']} ({entry['Timestamp']}): Benutzername: {entry['Username']}, Kategorie: {entry['Category']}, Passwort: {masked_password} [geändert: {changed}]")
+
+    restore = input(
+        '\nVersion wiederherstellen? '
+        '(Versionsnummer eingeben oder Enter zum Überspringen): '
+    ).strip()
+
+    if not restore:
+        return
+
+    try:
+        version = int(restore)
+    except ValueError:
+        print('Bitte eine gültige Zahl eingeben.')
+        return
+
+    try:
+        if manager.restore_version(service, version):
+            print(f'Version {version} von {service} wurde wiederhergestellt und gespeichert.')
+            print('Andere ungespeicherte Änderungen sind davon nicht betroffen.')
+        else:
+            print('Diese Version kann nicht wiederhergestellt werden.')
+    except (OSError, ValueError) as e:
+        print('Fehler beim Wiederherstellen:')
+        print(e)
+
+
+#Funktion zum Abfragen einer optionalen positiven Grenze
+def ask_positive_limit(prompt):
+    """
+    @brief Fragt eine positive Zahl ab, bis eine gültige Eingabe erfolgt.
+    
+    @param prompt Eingabeaufforderung
+    @return Die eingegebene Zahl oder None bei leerer Eingabe
+    """
+    while True:
+        value = input(prompt).strip()
+        if not value:
+            return None
+
+        try:
+            number = int(value)
+            if number > 0:
+                return number
+            else:
+                print('Bitte eine positive Zahl eingeben.')
+        except ValueError:
+            print('Ungültige Eingabe. Bitte eine Zahl eingeben.')
+
+
+#Funktion zum Bereinigen des Verlaufs
+def prune_history(manager: AccountManager):
+    """
+    @brief Entfernt alte Versionen aller Accounts nach einer Aufbewahrungsregel.
+    
+    Da entfernte Versionen nicht wiederhergestellt werden können, muss der
+    Vorgang vorher bestätigt werden.
+    
+    @param manager Der AccountManager mit dem Verlauf
+    """
+    print('\n--- Verlauf bereinigen ---')
+
+    max_versions = ask_positive_limit('Maximale Versionen pro Dienst (Enter = unbegrenzt): ')
+    max_age_days = ask_positive_limit('Maximales Alter in Tagen (Enter = unbegrenzt): ')
+
+    if max_versions is None and max_age_days is None:
+        print('Keine Begrenzung angegeben, es wird nichts entfernt.')
+        return
+
+    confirm = input('Alte Versionen endgültig entfernen? (j/n): ').strip().lower()
+    if confirm != 'j':
+        print('Bereinigen abgebrochen.')
+        return
+
+    try:
+        removed = manager.prune_history(max_versions, max_age_days)
+        print(f'{removed} alte Version(en) wurden entfernt.')
+    except (OSError, ValueError) as e:
+        print('Fehler beim Bereinigen des Verlaufs:')
+        print(e)
+
+
 #Funktion zum Generieren eines Passworts per KI
 def generate_password_ki(ki_service: KIService):
     while True:
@@ -211,8 +433,9 @@ def run_console_ui():
     manager = AccountManager()
 
     #Automatisches Laden der Accounts bei Programmstart
-    manager.load_from_json()
+    renamed = manager.load_from_json()
     print('Accounts wurden automatisch geladen.')
+    report_renamed_services(renamed)
 
     #KI-Service initialisieren
     ki_service = KIService()
@@ -243,6 +466,15 @@ def run_console_ui():
             case 7:
                 load_accounts(manager)
             
+            case 8:
+                edit_account(manager, ki_service)
+            
+            case 9:
+                show_history(manager)
+            
+            case 10:
+                prune_history(manager)
+            
             case 0:
                 print('Programm beendet.')
                 break
\ No newline at end of file
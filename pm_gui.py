@@ -5,6 +5,7 @@ Verwendet ttkbootstrap für eine moderne GUI.
 
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
+from ttkbootstrap.dialogs import Messagebox, Querybox
 
 from pm_account_manager import AccountManager
 from pm_ki_service import KIService
@@ -25,12 +26,13 @@ class PasswortManagerGUI:
         self.root.geometry('900x550')
 
         self.manager = AccountManager()
-        self.manager.load_from_json()
+        renamed = self.manager.load_from_json()
 
         self.ki_service = KIService()
 
         self.create_widgets()
         self.load_accounts_into_tree()
+        self.report_renamed_services(renamed)
 
     # ---------------- Widgets ----------------
 
@@ -93,6 +95,13 @@ class PasswortManagerGUI:
         ttk.Button(button_frame, text='Beenden', bootstyle='danger',
                    command=self.root.destroy).grid(row=1, column=3, padx=5, pady=5)
 
+        # Dritte Reihe
+        ttk.Button(button_frame, text='Verlauf', bootstyle='light',
+                   command=self.history_window).grid(row=2, column=0, padx=5, pady=5)
+
+        ttk.Button(button_frame, text='Verlauf bereinigen', bootstyle='light',
+                   command=self.prune_history).grid(row=2, column=1, padx=5, pady=5)
+
     # ---------------- Tabelle aktualisieren ----------------
 
     def load_accounts_into_tree(self):
@@ -133,17 +142,187 @@ class PasswortManagerGUI:
     def evaluate_password_window(self):
         print('KI Passwort bewerten')
 
+    # ---------------- Verlauf ----------------
+
+    def history_window(self):
+        """
+        @brief Zeigt den Verlauf eines Dienstes in einem eigenen Fenster.
+        
+        Zur Auswahl stehen alle Dienste mit Verlauf, auch bereits gelöschte.
+        Ist in der Tabelle ein Account markiert, wird dieser vorausgewählt.
+        Eine ausgewählte Version kann wiederhergestellt werden; danach werden
+        die Accounts gespeichert. Passwörter werden maskiert angezeigt.
+        """
+        try:
+            services = self.manager.list_history_services()
+        except ValueError as e:
+            Messagebox.show_error(str(e), title='Verlauf')
+            return
+
+        if not services:
+            Messagebox.show_info('Kein Verlauf vorhanden.', title='Verlauf')
+            return
+
+        window = ttk.Toplevel(self.root)
+        window.title('Verlauf')
+        window.geometry('800x400')
+
+        service_box = ttk.Combobox(window, values=services, state='readonly')
+        service_box.pack(fill=X, padx=20, pady=10)
+
+        history_tree = ttk.Treeview(
+            window,
+            columns=('Version', 'Zeitpunkt', 'Benutzername', 'Kategorie', 'Passwort'),
+            show='headings',
+            height=10
+        )
+
+        for column in ('Version', 'Zeitpunkt', 'Benutzername', 'Kategorie', 'Passwort'):
+            history_tree.heading(column, text=column)
+        history_tree.column('Version', width=70)
+        history_tree.column('Zeitpunkt', width=170)
+
+        history_tree.pack(fill=BOTH, expand=True, padx=20, pady=10)
+
+        def load_versions(event=None):
+            for item in history_tree.get_children():
+                history_tree.delete(item)
+
+            try:
+                versions = self.manager.get_history(service_box.get())
+            except ValueError as e:
+                Messagebox.show_error(str(e), title='Verlauf')
+                return
+
+            for entry in reversed(versions):
+                if entry['Deleted']:
+                    values = (entry['Version'], entry['Timestamp'], 'gelöscht', '', '')
+                else:
+                    values = (
+                        entry['Version'],
+                        entry['Timestamp'],
+                        entry['Username'],
+                        entry['Category'],
+                        '*' * len(entry['Password'])
+                    )
+                history_tree.insert('', 'end', values=values)
+
+        def restore_selected():
+            selected = history_tree.selection()
+            if not selected:
+                return
+
+            service = service_box.get()
+            version = int(history_tree.item(selected[0], 'values')[0])
+
+            try:
+                restored = self.manager.restore_version(service, version)
+            except (OSError, ValueError) as e:
+                Messagebox.show_error(str(e), title='Verlauf')
+                return
+
+            if restored:
+                self.load_accounts_into_tree()
+                window.destroy()
+                Messagebox.show_info(
+                    f'Version {version} von {service} wurde wiederhergestellt '
+                    'und gespeichert. Andere ungespeicherte Änderungen sind '
+                    'davon nicht betroffen.',
+                    title='Verlauf'
+                )
+            else:
+                Messagebox.show_warning(
+                    'Diese Version kann nicht wiederhergestellt werden.',
+                    title='Verlauf'
+                )
+
+        service_box.bind('<<ComboboxSelected>>', load_versions)
+
+        #Markierten Account vorauswählen, sonst den ersten Dienst
+        selection = self.tree.selection()
+        service = services[0]
+        if selection:
+            account = self.manager.list_accounts()[self.tree.index(selection[0])]
+            if account.service in services:
+                service = account.service
+        service_box.set(service)
+        load_versions()
+
+        ttk.Button(window, text='Wiederherstellen', bootstyle='light',
+                   command=restore_selected).pack(pady=10)
+
+    def prune_history(self):
+        """
+        @brief Entfernt alte Versionen nach Anzahl und/oder Alter.
+        
+        Leere Eingaben bedeuten keine Begrenzung. Da entfernte Versionen
+        nicht wiederhergestellt werden können, muss der Vorgang bestätigt werden.
+        """
+        limits = []
+        for prompt in ('Maximale Versionen pro Account (leer = unbegrenzt):',
+                       'Maximales Alter in Tagen (leer = unbegrenzt):'):
+            value = Querybox.get_string(prompt, title='Verlauf bereinigen')
+            if value is None:
+                return
+
+            value = value.strip()
+            if value and (not value.isdigit() or int(value) <= 0):
+                Messagebox.show_warning('Bitte eine positive Zahl eingeben.', title='Verlauf bereinigen')
+                return
+            limits.append(int(value) if value else None)
+
+        if limits == [None, None]:
+            Messagebox.show_info('Keine Begrenzung angegeben, es wird nichts entfernt.', title='Verlauf bereinigen')
+            return
+
+        answer = Messagebox.show_question(
+            'Alte Versionen endgültig entfernen?',
+            title='Verlauf bereinigen',
+            buttons=['Nein:secondary', 'Ja:primary']
+        )
+        if answer != 'Ja':
+            return
+
+        try:
+            removed = self.manager.prune_history(max_versions=limits[0], max_age_days=limits[1])
+        except (OSError, ValueError) as e:
+            Messagebox.show_error(str(e), title='Verlauf bereinigen')
+            return
+
+        Messagebox.show_info(f'{removed} alte Version(en) entfernt.', title='Verlauf bereinigen')
+
     def save_accounts(self):
-        """@brief Speichert alle Accounts in die JSON-Datei."""
-        self.manager.save_to_json()
+        """@brief Speichert alle Accounts in die JSON-Datei und ergänzt den Verlauf."""
+        try:
+            self.manager.save_to_json()
+        except (OSError, ValueError) as e:
+            Messagebox.show_error(str(e), title='Speichern')
+            return
         print('Gespeichert')
 
     def load_accounts(self):
         """@brief Lädt Accounts aus der JSON-Datei und aktualisiert die Anzeige."""
-        self.manager.load_from_json()
+        renamed = self.manager.load_from_json()
         self.load_accounts_into_tree()
+        self.report_renamed_services(renamed)
         print('Geladen')
 
+    def report_renamed_services(self, renamed):
+        """
+        @brief Meldet Accounts, deren doppelter Dienstname beim Laden geändert wurde.
+        
+        @param renamed Liste der Umbenennungen als (alter Name, neuer Name)
+        """
+        if not renamed:
+            return
+
+        lines = [f'{old_service} → {new_service}' for old_service, new_service in renamed]
+        Messagebox.show_warning(
+            'Doppelte Dienste wurden umbenannt (wird beim Speichern übernommen):\n'
+            + '\n'.join(lines),
+            title='Laden'
+        )
+
     # ---------------- Start ----------------
 
     def run(self):